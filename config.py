@@ -10,6 +10,8 @@ class Config:
     """Base configuration class. Contains settings common to all environments."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'a-secret-key-you-should-change'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Larger compiled-statement cache so repeated ORM queries skip SQL compilation.
+    SQLALCHEMY_ENGINE_OPTIONS = {'query_cache_size': 1200}
     # Add any other global settings here
 
 class DevelopmentConfig(Config):
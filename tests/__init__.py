@@ -1,7 +1,7 @@
 # C:\...\my_football_game\HTML\tests\test_config.py
 
 import unittest
-from app import create_app
+from textfootball import create_app
 from config import DevelopmentConfig, TestingConfig
 
 class ConfigTestCase(unittest.TestCase):
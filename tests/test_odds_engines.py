@@ -0,0 +1,85 @@
+# tests/test_odds_engines.py
+
+import random
+import unittest
+from textfootball import create_app, db
+from textfootball.models import Team, User
+from textfootball.blueprints.game.routes import _generate_starter_squad
+from textfootball.core import match_kernels
+from textfootball.core import match_simulator as ms
+from config import TestingConfig
+
+# Seeded, so every run compares the same samples. The scalar reference's standard error is
+# about 0.5 points on a probability and 0.015 goals; the tolerances sit at ~5 of those.
+REFERENCE_SIMULATIONS = 10000
+ENGINE_SIMULATIONS = 20000
+PROB_TOLERANCE = 2.5  # percentage points
+GOALS_TOLERANCE = 0.075  # goals per match
+
+class OddsEngineTestCase(unittest.TestCase):
+    """ Each odds engine against the scalar Monte Carlo reference (MatchSimulator.simulate). """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app(TestingConfig)
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.create_all()
+        random.seed(12345)
+        user = User(username='engines')
+        db.session.add(user)
+        db.session.commit()
+        teams = []
+        for name in ('Home', 'Away'):
+            team = Team(name=name, country='SE', user_id=user.id, color='#123456')
+            db.session.add(team)
+            db.session.commit()
+            _generate_starter_squad(team)
+            teams.append(team)
+        for player in teams[1].players: player.skill = 60  # a clear favourite
+        db.session.commit()
+
+        weak, strong = (ms.TeamSnapshot.from_model(t) for t in teams)
+        cls.fixtures = {'underdog at home': (weak, strong), 'favourite at home': (strong, weak)}
+        cls.references = {}
+        for name, (home, away) in cls.fixtures.items():
+            scores = ms._play_seeds(ms._headless_simulator((home, away, None, None)), range(REFERENCE_SIMULATIONS))
+            cls.references[name] = ms._summarize_scores(scores[:, 0], scores[:, 1], REFERENCE_SIMULATIONS)
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def assertMatchesReference(self, probs, reference, goals_tolerance=GOALS_TOLERANCE):
+        for key in ('win_prob', 'draw_prob', 'loss_prob'):
+            self.assertAlmostEqual(probs[key], reference[key], delta=PROB_TOLERANCE, msg=key)
+        for key in ('avg_goals_for', 'avg_goals_against'):
+            self.assertAlmostEqual(probs[key], reference[key], delta=goals_tolerance, msg=key)
+
+    def test_vectorized_engine(self):
+        for name, (home, away) in self.fixtures.items():
+            with self.subTest(fixture=name):
+                scores = ms._run_fixture_sims_vec(home, away, ENGINE_SIMULATIONS, seed=1)
+                self.assertMatchesReference(ms._summarize_scores(*scores, ENGINE_SIMULATIONS), self.references[name])
+
+    @unittest.skipUnless(match_kernels.NUMBA_AVAILABLE, 'the compiled engine needs Numba')
+    def test_compiled_engine(self):
+        for name, (home, away) in self.fixtures.items():
+            with self.subTest(fixture=name):
+                scores = ms._run_fixture_sims_compiled(home, away, ENGINE_SIMULATIONS, seed=1)
+                self.assertMatchesReference(ms._summarize_scores(*scores, ENGINE_SIMULATIONS), self.references[name])
+
+    def test_closed_form(self):
+        """ Within tolerance despite its known goal bias (see _run_fixture_closed_form). """
+        for name, (home, away) in self.fixtures.items():
+            with self.subTest(fixture=name):
+                probs = ms._run_fixture_closed_form(home, away, ENGINE_SIMULATIONS)
+                reference = self.references[name]
+                # The bias scales with the goal count: allow 5% of the reference on top.
+                tolerance = GOALS_TOLERANCE + 0.05 * max(reference['avg_goals_for'], reference['avg_goals_against'])
+                self.assertMatchesReference(probs, reference, goals_tolerance=tolerance)
+
+if __name__ == '__main__':
+    unittest.main()
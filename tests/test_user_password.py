@@ -0,0 +1,80 @@
+# tests/test_user_password.py
+
+import unittest
+from argon2 import PasswordHasher
+from werkzeug.security import generate_password_hash
+from textfootball import create_app, db
+from textfootball.models import User
+from config import TestingConfig
+
+class UserPasswordTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_argon2_round_trip(self):
+        """A freshly set password is stored as Argon2id and verifies."""
+        user = User(username='alice')
+        user.set_password('s3cret')
+        self.assertTrue(user.password_hash.startswith('$argon2id$'))
+        self.assertTrue(user.check_password('s3cret'))
+
+    def test_wrong_password(self):
+        """A wrong password is rejected and leaves the hash alone."""
+        user = User(username='alice')
+        user.set_password('s3cret')
+        stored = user.password_hash
+        self.assertFalse(user.check_password('wrong'))
+        self.assertEqual(user.password_hash, stored)
+
+    def test_legacy_hash_upgraded_on_login(self):
+        """pbkdf2 and scrypt hashes still log in, and the Argon2id upgrade is committed."""
+        for method in ('pbkdf2:sha256', 'scrypt'):
+            with self.subTest(method=method):
+                username = 'legacy_' + method.split(':')[0]
+                legacy = generate_password_hash('s3cret', method=method)
+                db.session.add(User(username=username, password_hash=legacy))
+                db.session.commit()
+
+                response = self.app.test_client().post('/login', data={'username': username, 'password': 's3cret'})
+                self.assertEqual(response.status_code, 302)
+                self.assertIn('/dashboard', response.headers['Location'])
+
+                db.session.expire_all()
+                user = User.query.filter_by(username=username).one()
+                self.assertTrue(user.password_hash.startswith('$argon2id$'))
+                self.assertTrue(user.check_password('s3cret'))
+
+    def test_legacy_hash_wrong_password(self):
+        """A wrong password against a legacy hash fails without upgrading it."""
+        legacy = generate_password_hash('s3cret', method='pbkdf2:sha256')
+        user = User(username='alice', password_hash=legacy)
+        self.assertFalse(user.check_password('wrong'))
+        self.assertEqual(user.password_hash, legacy)
+
+    def test_outdated_argon2_hash_rehashed(self):
+        """An Argon2 hash with weaker parameters than the current ones is replaced on success."""
+        weak = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1).hash('s3cret')
+        user = User(username='alice', password_hash=weak)
+        self.assertTrue(user.check_password('s3cret'))
+        self.assertNotEqual(user.password_hash, weak)
+        self.assertTrue(user.password_hash.startswith('$argon2id$'))
+        self.assertTrue(user.check_password('s3cret'))
+
+    def test_missing_or_malformed_hash(self):
+        """Empty and garbage hashes return False instead of raising."""
+        for stored in (None, '', 'garbage', 'pbkdf2:sha256:x$salt$zz', 'scrypt:1:2$s$h', '$argon2id$junk'):
+            with self.subTest(stored=stored):
+                user = User(username='alice', password_hash=stored)
+                self.assertFalse(user.check_password('s3cret'))
+                self.assertEqual(user.password_hash, stored)
+
+if __name__ == '__main__':
+    unittest.main()
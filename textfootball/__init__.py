@@ -7,6 +7,14 @@ from markupsafe import Markup
 # db is initialized here, but not attached to an app
 db = SQLAlchemy()
 
+# Imported once at module scope (after db exists, since models and blueprints import it)
+# rather than inside create_app / the per-render context processor.
+from .models import Team, User
+from .blueprints.auth.routes import auth_bp
+from .blueprints.game.routes import game_bp
+from .blueprints.league.routes import league_bp
+from .core import match_kernels
+
 # The factory now accepts a 'config_class' argument
 def create_app(config_class):
     app = Flask(__name__)
@@ -19,10 +27,7 @@ def create_app(config_class):
     # Initialize the database with our app
     db.init_app(app)
 
-    # Import and register the blueprints (this part remains the same)
-    from .blueprints.auth.routes import auth_bp
-    from .blueprints.game.routes import game_bp
-    from .blueprints.league.routes import league_bp
+    # Register the blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(game_bp)
     app.register_blueprint(league_bp)
@@ -30,9 +35,7 @@ def create_app(config_class):
     # Context processor to inject selected_team and user_teams into all templates
     @app.context_processor
     def inject_selected_team():
-        from .models.team import Team
-        from .models.user import User  # Import here to avoid circular dependencies
-        
+        user = None
         user_teams = []
         selected_team = None
         
@@ -45,7 +48,6 @@ def create_app(config_class):
             selected_team = Team.query.get(session['selected_team_id'])
             # Verify the team still exists and belongs to the user
             if selected_team and 'username' in session:
-                user = User.query.filter_by(username=session['username']).first()
                 if user and selected_team.user_id != user.id:
                     selected_team = None
                     session.pop('selected_team_id', None)
@@ -60,4 +62,7 @@ def create_app(config_class):
 
     app.jinja_env.filters['nl2br'] = nl2br
 
+    # Compile the odds kernels now (when Numba is installed) instead of on the first request
+    match_kernels.warm_up()
+
     return app
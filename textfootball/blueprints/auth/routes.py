@@ -39,6 +39,7 @@ def login():
         
         user = User.query.filter_by(username=username).first()
         if user and user.check_password(password):
+            db.session.commit()  # persists a password hash upgraded by check_password
             session['username'] = username
             flash('Login successful!', 'success')
             return redirect(url_for('game.dashboard'))
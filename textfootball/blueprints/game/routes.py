@@ -416,8 +416,7 @@ def recalculate_odds():
         return jsonify({'error': 'Authentication required'}), 401
 
     data = request.get_json()
-    # MODIFIED: Check for the new morale_params in the request
-    if not data or 'enemy_team_id' not in data or 'user_team_players' not in data or 'morale_params' not in data:
+    if not data or 'enemy_team_id' not in data or 'user_team_players' not in data:
         return jsonify({'error': 'Invalid request data'}), 400
 
     user_team_id = session.get('selected_team_id')
@@ -429,9 +428,6 @@ def recalculate_odds():
     if not user_team_model or not enemy_team_model:
         return jsonify({'error': 'Invalid team ID provided'}), 404
 
-    # NEW: Get the workbench's morale parameters from the request
-    morale_params_from_request = data.get('morale_params', {})
-
     # MODIFIED: Update player stats to include all new editable attributes
     modified_stats = {
         int(p['id']): {
@@ -462,12 +458,11 @@ def recalculate_odds():
 
     fixed_lineup_ids = session.get('workbench_fixed_lineup_ids')
 
-    # MODIFIED: Pass the morale parameters from the request into the odds calculation
     odds = get_prematch_odds(
         user_team_model=user_team_model,
         enemy_team_model=enemy_team_model,
         fixed_user_lineup_ids=fixed_lineup_ids,
-        morale_params=morale_params_from_request
+        use_cache=False  # each recalculation is a fresh sample, as in batch_odds
     )
 
     db.session.expunge_all()
@@ -484,7 +479,7 @@ def analyze_morale_settings():
 
     data = request.get_json()
     # Validate the data needed for this specific analysis
-    if not all(k in data for k in ['enemy_team_id', 'user_team_players', 'morale_params', 'analysis_params']):
+    if not all(k in data for k in ['enemy_team_id', 'user_team_players', 'analysis_params']):
         return jsonify({'error': 'Invalid request data for morale analysis'}), 400
 
     user_team_id = session.get('selected_team_id')
@@ -504,7 +499,6 @@ def analyze_morale_settings():
     morale_step = int(analysis_params.get('step', 10))
 
     # Get other necessary data from the request
-    morale_params_from_request = data.get('morale_params', {})
     fixed_lineup_ids = session.get('workbench_fixed_lineup_ids')
 
     results_over_morale = []
@@ -521,7 +515,7 @@ def analyze_morale_settings():
             user_team_model=user_team_model,
             enemy_team_model=enemy_team_model,
             fixed_user_lineup_ids=fixed_lineup_ids,
-            morale_params=morale_params_from_request
+            include_stats=False
         )
 
         # Store the results for this morale level
@@ -543,8 +537,7 @@ def batch_odds():
         return jsonify({'error': 'Authentication required'}), 401
 
     data = request.get_json()
-    # MODIFIED: Check for the new morale_params in the request
-    if not data or 'enemy_team_id' not in data or 'user_team_players' not in data or 'runs' not in data or 'morale_params' not in data:
+    if not data or 'enemy_team_id' not in data or 'user_team_players' not in data or 'runs' not in data:
         return jsonify({'error': 'Invalid request data'}), 400
 
     user_team_id = session.get('selected_team_id')
@@ -559,9 +552,6 @@ def batch_odds():
     if not user_team_model or not enemy_team_model:
         return jsonify({'error': 'Invalid team ID provided'}), 404
 
-    # NEW: Get the workbench's morale parameters from the request
-    morale_params_from_request = data.get('morale_params', {})
-
     # MODIFIED: Update player stats to include all new editable attributes
     modified_stats = {
         int(p['id']): {
@@ -601,12 +591,12 @@ def batch_odds():
     sims_per_run = None
 
     for _ in range(runs):
-        # MODIFIED: Pass the morale parameters from the request into the odds calculation
         res = get_prematch_odds(
             user_team_model=user_team_model,
             enemy_team_model=enemy_team_model,
             fixed_user_lineup_ids=fixed_lineup_ids,
-            morale_params=morale_params_from_request
+            include_stats=False,
+            use_cache=False  # every run must be an independent sample
         )
         sims_per_run = res.get('simulations_run', sims_per_run)
 
@@ -1,6 +1,7 @@
 # textfootball/models/player.py
 
 from textfootball import db
+from sqlalchemy.ext.hybrid import hybrid_property
 import enum
 import math
 
@@ -69,7 +70,7 @@ class Player(db.Model):
     # Requirement: 100 should be neutral (1.0x multiplier).
     MORALE_NEUTRAL_POINT = 100
 
-    @property
+    @hybrid_property
     def effective_skill(self):
         """ General on-pitch effectiveness, influenced by shape AND morale. """
         # 1. Calculate base effectiveness from shape.
@@ -94,6 +95,14 @@ class Player(db.Model):
 
         return base_effectiveness * morale_multiplier
 
+    @effective_skill.expression
+    def effective_skill(cls):
+        """ The same formula as a SQL expression, so queries can filter and order by it. """
+        base_effectiveness = cls.skill * (0.3 + cls.shape * 0.7 / 100.0)
+        if MORALE_EFFECT_ACTIVE == 1:
+            return base_effectiveness * db.case((cls.morale >= 100, 1.0), else_=1.0 - (100 - cls.morale) / 100.0 * cls.MORALE_IMPACT_FACTOR)
+        return base_effectiveness
+
     @property
     def has_free_kick_trait(self):
         """ Check if player has earned the Free Kick Specialist trait """
@@ -1,18 +1,40 @@
 # textfootball/models/user.py
 
 from textfootball import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+# Argon2id at the OWASP baseline (19 MiB, 2 passes): memory-hard, and much cheaper per
+# login than werkzeug's default hashes. Hashes stored before the switch are werkzeug's;
+# they still verify, and are upgraded to Argon2 on the next successful login.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
+    username = db.Column(db.String(80), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(128))
     teams = db.relationship('Team', backref='user', lazy=True, cascade="all, delete-orphan")
     sent_messages = db.relationship('Message', foreign_keys='Message.sender_id', backref='sender', lazy=True, cascade="all, delete-orphan")
     received_messages = db.relationship('Message', foreign_keys='Message.recipient_id', backref='recipient', lazy=True, cascade="all, delete-orphan")
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = _password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """ Verifies the password; a legacy or outdated hash is replaced on success, so the
+        caller should commit the session after a successful check. """
+        if not self.password_hash: return False
+        if not self.password_hash.startswith('$argon2'):
+            try:
+                if not check_password_hash(self.password_hash, password): return False
+            except ValueError:  # malformed legacy hash
+                return False
+            self.set_password(password)
+            return True
+        try:
+            _password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        if _password_hasher.check_needs_rehash(self.password_hash): self.set_password(password)
+        return True